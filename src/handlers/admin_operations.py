@@ -253,9 +253,12 @@ def _add_cognito_users_to_map(
     """Search Cognito by email and add users to results map."""
     cognito_users = _search_users_in_cognito_by_email_prefix(cognito, user_pool_id, query, logger)
     for cognito_user in cognito_users:
+        # Skip users already found via DynamoDB before paying for the group/display-name lookups
+        username, attributes = _extract_cognito_attributes(cognito_user)
+        if attributes.get("sub", username) in results_map:
+            continue
         admin_user = _build_admin_user(cognito, user_pool_id, cognito_user, logger)
-        if admin_user["accountId"] not in results_map:
-            results_map[admin_user["accountId"]] = admin_user
+        results_map[admin_user["accountId"]] = admin_user
 
 
 def _search_by_general_query(query: str, cognito: Any, user_pool_id: str, logger: Any) -> dict[str, Dict[str, Any]]:
@@ -948,9 +951,15 @@ def _soft_delete_catalog(catalog_id: str) -> None:
 
 
 def _scan_and_delete_catalogs(db_account_id: str) -> int:
-    """Scan for user's catalogs and soft delete them. Returns count."""
+    """Scan for user's catalogs and soft delete them. Returns count.
+
+    Each catalog is soft-deleted with its own UpdateItem that only sets isDeleted, so concurrent
+    edits to other attributes are never overwritten (BatchWriteItem has no update operation).
+    The scan only projects the key, since nothing else is needed for the update.
+    """
     deleted_count = 0
     scan_kwargs: Dict[str, Any] = {
+        "ProjectionExpression": "catalogId",
         "FilterExpression": "ownerAccountId = :owner AND (attribute_not_exists(isDeleted) OR isDeleted = :false)",
         "ExpressionAttributeValues": {":owner": db_account_id, ":false": False},
     }
@@ -4,6 +4,8 @@ Lambda handler for PaymentMethod.qrCodeUrl field resolver.
 Generates a single presigned URL for a payment method QR code.
 """
 
+import time
+from functools import lru_cache
 from typing import Any, Dict
 
 try:  # pragma: no cover
@@ -16,9 +18,39 @@ except ModuleNotFoundError:  # pragma: no cover
     from ..utils.payment_methods import generate_presigned_get_url
 
 
+# Presigned QR code URLs are valid for 15 minutes
+_PRESIGNED_URL_EXPIRY_SECONDS = 900
+
+# Reuse a presigned URL for the same (owner, s3Key) within a 5-minute window, so every
+# cached URL still has at least 10 minutes of validity left when it is returned
+_PRESIGNED_URL_CACHE_WINDOW_SECONDS = 300
+
+
+@lru_cache(maxsize=256)
+def _cached_presigned_get_url(owner_account_id: str, method_name: str, s3_key: str, window: int) -> str | None:
+    """Generate a presigned URL, memoized per cache window (the window only keys the cache)."""
+    presigned_url: str | None = generate_presigned_get_url(
+        owner_account_id, method_name, s3_key, expiry_seconds=_PRESIGNED_URL_EXPIRY_SECONDS
+    )
+    return presigned_url
+
+
+def _get_presigned_url(owner_account_id: str, method_name: str, s3_key: str | None) -> str | None:
+    """Return a presigned URL, reusing a recent one when the S3 key is known."""
+    if not s3_key:
+        # Without a key the lookup depends on what is currently in S3, so never cache it
+        presigned_url: str | None = generate_presigned_get_url(
+            owner_account_id, method_name, s3_key, expiry_seconds=_PRESIGNED_URL_EXPIRY_SECONDS
+        )
+        return presigned_url
+    window = int(time.time() // _PRESIGNED_URL_CACHE_WINDOW_SECONDS)
+    return _cached_presigned_get_url(owner_account_id, method_name, s3_key, window)
+
+
 def _is_already_presigned(qr_code_url: str) -> bool:
-    """Check if URL is already a presigned URL."""
-    return "X-Amz-Algorithm" in qr_code_url or "X-Amz-Signature" in qr_code_url
+    """Check if URL is already a presigned URL (signing parameters only ever appear in the query string)."""
+    query = qr_code_url.partition("?")[2]
+    return "X-Amz-Algorithm=" in query or "X-Amz-Signature=" in query
 
 
 def _validate_and_extract_params(event: Dict[str, Any]) -> tuple[str, str, str | None]:
@@ -54,9 +86,7 @@ def generate_qr_code_presigned_url(event: Dict[str, Any], context: Any) -> str |
 
         owner_account_id, method_name, s3_key = _validate_and_extract_params(event)
 
-        presigned_url: str | None = generate_presigned_get_url(
-            owner_account_id, method_name, s3_key, expiry_seconds=900
-        )
+        presigned_url = _get_presigned_url(owner_account_id, method_name, s3_key)
 
         logger.info("Generated QR code presigned URL", owner_account_id=owner_account_id, method_name=method_name)
         return presigned_url
@@ -9,18 +9,20 @@ This Lambda is necessary because:
 3. We need to query campaigns for shared profiles (1 shares query + N campaign queries)
 4. A pipeline resolver can't dynamically query N profiles
 
-Uses aioboto3 for async parallel queries:
+Uses the aioboto3 low-level DynamoDB client for async parallel queries:
 - owned_profile_ids and shared_profile_ids run concurrently
-- owned_catalog_ids and shared_catalog_ids wait for their respective profile_ids, then run N queries in parallel
+- owned_catalog_ids and shared_catalog_ids each wait only for their own profile_ids, then run N queries in parallel
 
 GraphQL query: listCatalogsInUse
 Returns: [ID!]! (list of catalog IDs)
 """
 
 import asyncio
-from typing import Any, Dict, List, Set, Tuple
+import os
+from typing import Any, Awaitable, Dict, Iterator, List, Set, Tuple
 
 import aioboto3
+from aiobotocore.config import AioConfig
 
 # Handle both Lambda (absolute) and unit test (relative) imports
 try:  # pragma: no cover
@@ -35,118 +37,206 @@ except ModuleNotFoundError:  # pragma: no cover
 
 logger = get_logger(__name__)
 
+# Module-level aioboto3 session, reused across warm invocations
+_session: aioboto3.Session | None = None
 
-async def _extract_field_values(items: list[Dict[str, Any]], field_name: str) -> List[str]:
-    """Extract field values from DynamoDB items."""
-    return [item[field_name] for item in items if item.get(field_name)]
+# Module-level event loop and DynamoDB client, reused across warm invocations.
+# The client's connection pool is bound to the loop it was opened on, so both must outlive a single request.
+_loop: asyncio.AbstractEventLoop | None = None
+_dynamodb_client: Any = None
 
+# DynamoDB client tuning: enough pooled connections for the per-profile campaign fan-out (the default of 10
+# would queue requests), fail fast on stalled connections, and back off adaptively when throttled
+_DYNAMODB_CONFIG = AioConfig(
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=10,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
 
-async def _handle_pagination(table: Any, query_params: Dict[str, Any], field_name: str) -> List[str]:
-    """Handle DynamoDB pagination for query operations."""
-    results: List[str] = []
-    response = await table.query(**query_params)
-    results.extend(await _extract_field_values(response.get("Items", []), field_name))
 
-    while response.get("LastEvaluatedKey"):
-        query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-        response = await table.query(**query_params)
-        results.extend(await _extract_field_values(response.get("Items", []), field_name))
+def _get_session() -> aioboto3.Session:
+    """Get the aioboto3 session, creating it on first use so credentials and service models load once."""
+    global _session
+    if _session is None:
+        _session = aioboto3.Session()
+    return _session
 
-    return results
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the module event loop, creating it on first use (or if it was closed).
+
+    A new loop also drops the cached DynamoDB client, whose connection pool belonged to the old loop.
+    """
+    global _loop, _dynamodb_client
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _dynamodb_client = None
+    return _loop
+
+
+def _run_on_event_loop(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine to completion on the module event loop, then cancel any tasks it left behind.
+
+    asyncio.run would cancel leftover tasks when closing its loop; the module loop stays open, so when one
+    gathered chain fails the sibling chain is cancelled here instead of resuming during the next invocation.
+    """
+    loop = _get_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+async def _get_dynamodb() -> Any:
+    """Get the low-level DynamoDB client, opening it once so warm invocations reuse its pooled connections.
+
+    The low-level client returns raw AttributeValues, skipping the resource layer's type (de)serializers.
+    """
+    global _dynamodb_client
+    if _dynamodb_client is None:
+        client_context = _get_session().client(
+            "dynamodb", endpoint_url=os.getenv("DYNAMODB_ENDPOINT"), config=_DYNAMODB_CONFIG
+        )
+        _dynamodb_client = await client_context.__aenter__()
+    return _dynamodb_client
+
+
+def _extract_field_values(items: list[Dict[str, Any]], field_name: str) -> Iterator[str]:
+    """Lazily yield non-empty string values of a field from raw (low-level client) DynamoDB items."""
+    return (value for item in items if (value := item.get(field_name, {}).get("S")))
+
+
+async def _query_field_values(
+    client: Any, query_params: Dict[str, Any], field_name: str, values: Set[str] | None = None
+) -> Set[str]:
+    """Run a single-attribute DynamoDB query across all pages and return the distinct values of that attribute.
+
+    The client's query paginator follows LastEvaluatedKey; each page streams straight into the result set.
+    Pass `values` to stream into an existing set (e.g. one shared by concurrent queries) instead of a new one.
+    """
+    if values is None:
+        values = set()
+    async for page in client.get_paginator("query").paginate(**query_params):
+        values.update(_extract_field_values(page.get("Items", []), field_name))
+    return values
 
 
 async def _async_get_owned_profile_ids(
     dynamodb: Any, profiles_table_name: str, owner_account_id: str, request_logger: Any = logger
-) -> List[str]:
+) -> Set[str]:
     """Async: Query profiles owned by this account."""
-    table = await dynamodb.Table(profiles_table_name)
     query_params = {
+        "TableName": profiles_table_name,
         "KeyConditionExpression": "ownerAccountId = :ownerAccountId",
-        "ExpressionAttributeValues": {":ownerAccountId": owner_account_id},
+        "ExpressionAttributeValues": {":ownerAccountId": {"S": owner_account_id}},
         "ProjectionExpression": "profileId",
     }
-    return await _handle_pagination(table, query_params, "profileId")
+    return await _query_field_values(dynamodb, query_params, "profileId")
 
 
-async def _async_get_campaigns_for_profile(dynamodb: Any, campaigns_table_name: str, profile_id: str) -> Set[str]:
-    """Async: Query campaigns for a specific profile and return catalog IDs."""
-    table = await dynamodb.Table(campaigns_table_name)
+async def _async_get_campaigns_for_profile(
+    dynamodb: Any, campaigns_table_name: str, profile_id: str, catalog_ids: Set[str] | None = None
+) -> Set[str]:
+    """Async: Query campaigns for a specific profile and return catalog IDs (added to `catalog_ids` if given)."""
     query_params = {
+        "TableName": campaigns_table_name,
         "KeyConditionExpression": "profileId = :profileId",
-        "ExpressionAttributeValues": {":profileId": profile_id},
+        "ExpressionAttributeValues": {":profileId": {"S": profile_id}},
         "ProjectionExpression": "catalogId",
     }
-    catalog_list = await _handle_pagination(table, query_params, "catalogId")
-    return set(catalog_list)
+    return await _query_field_values(dynamodb, query_params, "catalogId", catalog_ids)
 
 
-async def _async_get_shared_profile_ids(dynamodb: Any, shares_table_name: str, target_account_id: str) -> List[str]:
+async def _async_get_shared_profile_ids(dynamodb: Any, shares_table_name: str, target_account_id: str) -> Set[str]:
     """Async: Get profile IDs that are shared with this account."""
-    table = await dynamodb.Table(shares_table_name)
     query_params = {
+        "TableName": shares_table_name,
         "IndexName": "targetAccountId-index",
         "KeyConditionExpression": "targetAccountId = :targetAccountId",
-        "ExpressionAttributeValues": {":targetAccountId": target_account_id},
+        "ExpressionAttributeValues": {":targetAccountId": {"S": target_account_id}},
         "ProjectionExpression": "profileId",
     }
-    return await _handle_pagination(table, query_params, "profileId")
+    return await _query_field_values(dynamodb, query_params, "profileId")
 
 
 async def _async_get_shared_campaign_catalog_ids(
-    dynamodb: Any, campaigns_table_name: str, profile_ids: List[str], request_logger: Any = logger
+    dynamodb: Any, campaigns_table_name: str, profile_ids: Set[str], request_logger: Any = logger
 ) -> Set[str]:
     """Async: Query campaigns for all profiles in parallel."""
     if not profile_ids:
         return set()
 
-    # Create tasks for all profile queries
-    tasks = [_async_get_campaigns_for_profile(dynamodb, campaigns_table_name, pid) for pid in profile_ids]
+    # Every profile query streams its catalog IDs into one shared set; the event loop runs them one step at a time,
+    # so no locking is needed
+    catalog_ids: Set[str] = set()
+    tasks = [
+        _async_get_campaigns_for_profile(dynamodb, campaigns_table_name, pid, catalog_ids) for pid in profile_ids
+    ]
 
-    # Run all queries concurrently and collect results
+    # Run all queries concurrently, logging any exceptions without failing the overall operation
     results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Combine results, logging any exceptions without failing the overall operation
-    catalog_ids: Set[str] = set()
-    for result in results:
-        if isinstance(result, set):
-            catalog_ids.update(result)
-        elif isinstance(result, BaseException):
-            request_logger.error("Failed to query campaign catalogs", error=str(result), exc_info=result)
+    for error in (result for result in results if isinstance(result, BaseException)):
+        request_logger.error("Failed to query campaign catalogs", error=str(error), exc_info=error)
 
     return catalog_ids
 
 
-async def _async_get_all_catalog_ids(account_id: str, request_logger: Any = logger) -> Tuple[Set[str], List[str], Set[str]]:
+async def _async_get_profile_catalog_ids(
+    dynamodb: Any,
+    campaigns_table_name: str,
+    profile_ids_query: Awaitable[Set[str]],
+    request_logger: Any = logger,
+) -> Tuple[Set[str], Set[str]]:
+    """Async: Await a profile ID query, then query campaigns for those profiles as soon as it resolves."""
+    profile_ids = await profile_ids_query
+    catalog_ids = await _async_get_shared_campaign_catalog_ids(
+        dynamodb, campaigns_table_name, profile_ids, request_logger
+    )
+    return profile_ids, catalog_ids
+
+
+async def _async_get_all_catalog_ids(
+    account_id: str, request_logger: Any = logger, *, dynamodb: Any = None
+) -> Tuple[Set[str], Set[str], Set[str]]:
     """
     Run all queries with optimal parallelism.
 
     Flow:
     - owned_profile_ids and shared_profile_ids run concurrently
-    - owned_catalog_ids and shared_catalog_ids wait for their respective profile_ids, then runs N queries in parallel
+    - each chain's campaign queries start as soon as its own profile_ids resolve, without waiting for the other chain
+
+    Args:
+        dynamodb: Low-level DynamoDB client to query with (defaults to the cached module client)
     """
     campaigns_table_name = get_required_env("CAMPAIGNS_TABLE_NAME")
     profiles_table_name = get_required_env("PROFILES_TABLE_NAME")
     shares_table_name = get_required_env("SHARES_TABLE_NAME")
 
-    session = aioboto3.Session()
-    async with session.resource("dynamodb") as dynamodb:
-        # Step 1 & 2: Run owned profiles and shared profiles queries in parallel
-        owned_profiles_task = _async_get_owned_profile_ids(dynamodb, profiles_table_name, account_id)
-        shared_profiles_task = _async_get_shared_profile_ids(dynamodb, shares_table_name, account_id)
-
-        owned_profile_ids, shared_profile_ids = await asyncio.gather(owned_profiles_task, shared_profiles_task)
+    if dynamodb is None:
+        dynamodb = await _get_dynamodb()
 
-        # Step 3 & 4: Query campaigns for both owned and shared profiles in parallel
-        owned_catalogs_task = _async_get_shared_campaign_catalog_ids(
-            dynamodb, campaigns_table_name, owned_profile_ids, request_logger
-        )
-        shared_catalogs_task = _async_get_shared_campaign_catalog_ids(
-            dynamodb, campaigns_table_name, shared_profile_ids, request_logger
-        )
+    # Owned chain (profiles -> campaigns) and shared chain (shares -> campaigns) run as two independent pipelines
+    owned_chain = _async_get_profile_catalog_ids(
+        dynamodb,
+        campaigns_table_name,
+        _async_get_owned_profile_ids(dynamodb, profiles_table_name, account_id),
+        request_logger,
+    )
+    shared_chain = _async_get_profile_catalog_ids(
+        dynamodb,
+        campaigns_table_name,
+        _async_get_shared_profile_ids(dynamodb, shares_table_name, account_id),
+        request_logger,
+    )
 
-        owned_catalog_ids, shared_catalog_ids = await asyncio.gather(owned_catalogs_task, shared_catalogs_task)
+    (_, owned_catalog_ids), (shared_profile_ids, shared_catalog_ids) = await asyncio.gather(owned_chain, shared_chain)
 
-        return owned_catalog_ids, shared_profile_ids, shared_catalog_ids
+    return owned_catalog_ids, shared_profile_ids, shared_catalog_ids
 
 
 def handler(event: Dict[str, Any], context: Any) -> List[str]:
@@ -171,7 +261,7 @@ def handler(event: Dict[str, Any], context: Any) -> List[str]:
         # Run all queries with optimal parallelism:
         # - owned_catalog_ids and shared_profile_ids run concurrently
         # - shared_catalog_ids waits for shared_profile_ids, then runs N queries in parallel
-        owned_catalog_ids, shared_profile_ids, shared_catalog_ids = asyncio.run(
+        owned_catalog_ids, shared_profile_ids, shared_catalog_ids = _run_on_event_loop(
             _async_get_all_catalog_ids(account_id_with_prefix, request_logger)
         )
 
@@ -179,11 +269,11 @@ def handler(event: Dict[str, Any], context: Any) -> List[str]:
         request_logger.info("Found shared profiles", count=len(shared_profile_ids))
         request_logger.info("Found shared campaign catalogs", count=len(shared_catalog_ids))
 
-        # Combine and deduplicate
-        all_catalog_ids = owned_catalog_ids | shared_catalog_ids
-        request_logger.info("Total unique catalogs in use", count=len(all_catalog_ids))
+        # Combine and deduplicate in place; owned_catalog_ids is a fresh set built for this request
+        owned_catalog_ids |= shared_catalog_ids
+        request_logger.info("Total unique catalogs in use", count=len(owned_catalog_ids))
 
-        return sorted(all_catalog_ids)
+        return sorted(owned_catalog_ids)
 
     except AppError:
         raise
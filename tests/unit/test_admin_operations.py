@@ -2529,6 +2529,48 @@ class TestAdminDeleteUserCatalogs:
             assert mock_tables.catalogs.update_item.call_count == 3
             # Verify delete_item was NOT called
             assert mock_tables.catalogs.delete_item.call_count == 0
+            # Only the key is read back from the scan
+            assert all(
+                c.kwargs["ProjectionExpression"] == "catalogId" for c in mock_tables.catalogs.scan.call_args_list
+            )
+
+    def test_soft_delete_preserves_catalog_attributes(
+        self,
+        catalogs_table: Any,
+        admin_appsync_event: Dict[str, Any],
+        lambda_context: Any,
+    ) -> None:
+        """Test that soft delete only sets isDeleted and leaves other catalog attributes intact."""
+        from src.handlers.admin_operations import admin_delete_user_catalogs
+
+        catalogs_table.put_item(
+            Item={
+                "catalogId": "catalog-1",
+                "ownerAccountId": "ACCOUNT#target-user-123",
+                "catalogName": "Fall Popcorn",
+                "products": [{"productId": "p1", "productName": "Caramel Corn"}],
+            }
+        )
+        catalogs_table.put_item(
+            Item={"catalogId": "catalog-other", "ownerAccountId": "ACCOUNT#someone-else", "catalogName": "Other"}
+        )
+
+        event = {
+            **admin_appsync_event,
+            "arguments": {"accountId": "target-user-123"},
+        }
+
+        result = admin_delete_user_catalogs(event, lambda_context)
+
+        assert result == 1
+        assert catalogs_table.get_item(Key={"catalogId": "catalog-1"})["Item"] == {
+            "catalogId": "catalog-1",
+            "ownerAccountId": "ACCOUNT#target-user-123",
+            "catalogName": "Fall Popcorn",
+            "products": [{"productId": "p1", "productName": "Caramel Corn"}],
+            "isDeleted": True,
+        }
+        assert "isDeleted" not in catalogs_table.get_item(Key={"catalogId": "catalog-other"})["Item"]
 
     def test_non_admin_forbidden(
         self,
@@ -2711,6 +2753,55 @@ class TestAdminSearchUser:
                 Limit=50,
             )
 
+    def test_search_user_skips_enriching_duplicate_cognito_users(
+        self,
+        admin_appsync_event: Dict[str, Any],
+        lambda_context: Any,
+        monkeypatch: Any,
+    ) -> None:
+        """Test Cognito prefix results already found via DynamoDB are not rebuilt, new ones are merged."""
+        monkeypatch.setenv("USER_POOL_ID", "test-pool-id")
+
+        event = {
+            **admin_appsync_event,
+            "info": {"fieldName": "adminSearchUser"},
+            "arguments": {"query": "user"},
+        }
+
+        def make_cognito_user(sub: str) -> Dict[str, Any]:
+            return {
+                "Username": f"{sub}@example.com",
+                "Attributes": [
+                    {"Name": "sub", "Value": sub},
+                    {"Name": "email", "Value": f"{sub}@example.com"},
+                ],
+                "Enabled": True,
+                "UserStatus": "CONFIRMED",
+            }
+
+        with patch("src.handlers.admin_operations._get_cognito_client") as mock_get_client:
+            with patch("src.handlers.admin_operations.tables") as mock_tables:
+                mock_client = MagicMock()
+                mock_get_client.return_value = mock_client
+
+                mock_tables.accounts.scan.return_value = {
+                    "Items": [{"accountId": "ACCOUNT#user-logged-in", "email": "user-logged-in@example.com"}]
+                }
+                mock_client.list_users.side_effect = [
+                    {"Users": [make_cognito_user("user-logged-in")]},  # DynamoDB sub lookup
+                    # Email prefix search returns the known user plus one who never logged in
+                    {"Users": [make_cognito_user("user-logged-in"), make_cognito_user("user-cognito-only")]},
+                ]
+                mock_client.admin_list_groups_for_user.return_value = {"Groups": []}
+                mock_tables.accounts.get_item.return_value = {}
+
+                result = admin_search_user(event, lambda_context)
+
+                assert sorted(user["accountId"] for user in result) == ["user-cognito-only", "user-logged-in"]
+                # One enrichment per distinct user, none for the duplicate
+                assert mock_client.admin_list_groups_for_user.call_count == 2
+                assert mock_tables.accounts.get_item.call_count == 2
+
     def test_search_user_multiple_matches(
         self,
         admin_appsync_event: Dict[str, Any],
@@ -4,7 +4,6 @@ Unit tests for generate_qr_code_presigned_url Lambda handler.
 Tests the QR code presigned URL generation for payment methods.
 """
 
-import os
 from typing import Any, Dict, Generator
 from unittest.mock import patch
 
@@ -12,89 +11,90 @@ import boto3
 import pytest
 from moto import mock_aws
 
-from src.handlers.generate_qr_code_presigned_url import generate_qr_code_presigned_url
+from src.handlers.generate_qr_code_presigned_url import _cached_presigned_get_url, generate_qr_code_presigned_url
 from src.utils.errors import AppError, ErrorCode
 
-
-@pytest.fixture
-def aws_credentials() -> None:
-    """Set fake AWS credentials for moto."""
-    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
-    os.environ["AWS_SECURITY_TOKEN"] = "testing"
-    os.environ["AWS_SESSION_TOKEN"] = "testing"
-    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+BUCKET_NAME = "test-exports-bucket"
 
 
-@pytest.fixture
-def s3_bucket(aws_credentials: None) -> Generator[Any, None, None]:
-    """Create mock S3 bucket for QR code storage."""
+@pytest.fixture(scope="module")
+def mock_s3() -> Generator[Any, None, None]:
+    """Start the moto S3 mock, build one S3 client, and create the QR code bucket for the whole module."""
     with mock_aws():
         s3 = boto3.client("s3", region_name="us-east-1")
-        bucket_name = "test-exports-bucket"
-        s3.create_bucket(Bucket=bucket_name)
-        os.environ["EXPORTS_BUCKET"] = bucket_name
+        s3.create_bucket(Bucket=BUCKET_NAME)
         yield s3
 
 
-class TestGenerateQrCodePresignedUrl:
-    """Test generate_qr_code_presigned_url Lambda handler."""
-
-    def test_returns_none_when_no_qr_code_url(self) -> None:
-        """Test that None is returned when qrCodeUrl is not provided."""
-        event: Dict[str, Any] = {
-            "qrCodeUrl": None,
-            "ownerAccountId": "account-123",
-            "methodName": "Venmo",
-            "s3Key": "payment-qr-codes/account-123/venmo.png",
-        }
-
-        result = generate_qr_code_presigned_url(event, None)
+@pytest.fixture
+def s3_bucket(mock_s3: Any, monkeypatch: pytest.MonkeyPatch) -> Generator[Any, None, None]:
+    """Point EXPORTS_BUCKET at the shared mock bucket and empty it after each test."""
+    monkeypatch.setenv("EXPORTS_BUCKET", BUCKET_NAME)
+    yield mock_s3
+    for obj in mock_s3.list_objects_v2(Bucket=BUCKET_NAME).get("Contents", []):
+        mock_s3.delete_object(Bucket=BUCKET_NAME, Key=obj["Key"])
 
-        assert result is None
 
-    def test_returns_none_when_qr_code_url_empty(self) -> None:
-        """Test that None is returned when qrCodeUrl is empty string."""
-        event: Dict[str, Any] = {
-            "qrCodeUrl": "",
-            "ownerAccountId": "account-123",
-            "methodName": "Venmo",
-            "s3Key": "payment-qr-codes/account-123/venmo.png",
-        }
+@pytest.fixture(autouse=True)
+def clear_presigned_url_cache() -> Generator[None, None, None]:
+    """Start every test with an empty presigned URL cache."""
+    _cached_presigned_get_url.cache_clear()
+    yield
+    _cached_presigned_get_url.cache_clear()
 
-        result = generate_qr_code_presigned_url(event, None)
 
-        assert result is None
+class TestGenerateQrCodePresignedUrl:
+    """Test generate_qr_code_presigned_url Lambda handler."""
 
-    def test_returns_existing_presigned_url_with_algorithm(self) -> None:
-        """Test that existing presigned URLs with X-Amz-Algorithm are returned as-is."""
-        existing_url = "https://bucket.s3.amazonaws.com/key?X-Amz-Algorithm=AWS4-HMAC-SHA256&other=params"
+    @pytest.mark.parametrize(
+        ("qr_code_url", "expected"),
+        [
+            pytest.param(None, None, id="no-qr-code-url"),
+            pytest.param("", None, id="empty-qr-code-url"),
+            pytest.param(
+                "https://bucket.s3.amazonaws.com/key?X-Amz-Algorithm=AWS4-HMAC-SHA256&other=params",
+                "https://bucket.s3.amazonaws.com/key?X-Amz-Algorithm=AWS4-HMAC-SHA256&other=params",
+                id="presigned-with-algorithm",
+            ),
+            pytest.param(
+                "https://bucket.s3.amazonaws.com/key?X-Amz-Signature=abc123&other=params",
+                "https://bucket.s3.amazonaws.com/key?X-Amz-Signature=abc123&other=params",
+                id="presigned-with-signature",
+            ),
+        ],
+    )
+    def test_passthrough_without_presigning(self, qr_code_url: str | None, expected: str | None) -> None:
+        """Test that a missing qrCodeUrl returns None and an already-presigned URL is returned as-is."""
         event: Dict[str, Any] = {
-            "qrCodeUrl": existing_url,
+            "qrCodeUrl": qr_code_url,
             "ownerAccountId": "account-123",
             "identity": {"sub": "account-123"},
             "methodName": "Venmo",
             "s3Key": "payment-qr-codes/account-123/venmo.png",
         }
 
-        result = generate_qr_code_presigned_url(event, None)
+        with patch("src.handlers.generate_qr_code_presigned_url.generate_presigned_get_url") as mock_generate:
+            result = generate_qr_code_presigned_url(event, None)
 
-        assert result == existing_url
+        assert result == expected
+        mock_generate.assert_not_called()
 
-    def test_returns_existing_presigned_url_with_signature(self) -> None:
-        """Test that existing presigned URLs with X-Amz-Signature are returned as-is."""
-        existing_url = "https://bucket.s3.amazonaws.com/key?X-Amz-Signature=abc123&other=params"
+    def test_presigns_url_with_signing_marker_outside_query(self) -> None:
+        """Test that signing parameter names in the URL path do not count as presigned."""
         event: Dict[str, Any] = {
-            "qrCodeUrl": existing_url,
+            "qrCodeUrl": "https://bucket.s3.amazonaws.com/X-Amz-Signature=venmo.png",
             "ownerAccountId": "account-123",
             "identity": {"sub": "account-123"},
             "methodName": "Venmo",
             "s3Key": "payment-qr-codes/account-123/venmo.png",
         }
 
-        result = generate_qr_code_presigned_url(event, None)
+        with patch("src.handlers.generate_qr_code_presigned_url.generate_presigned_get_url") as mock_generate:
+            mock_generate.return_value = "https://example.com/signed"
+            result = generate_qr_code_presigned_url(event, None)
 
-        assert result == existing_url
+        assert result == "https://example.com/signed"
+        mock_generate.assert_called_once()
 
     def test_raises_unauthorized_when_no_owner_id(self) -> None:
         """Test that UNAUTHORIZED error is raised when ownerAccountId is missing."""
@@ -135,8 +135,7 @@ class TestGenerateQrCodePresignedUrl:
         s3_key = f"payment-qr-codes/{owner_account_id}/venmo.png"
 
         # Upload a test object
-        bucket_name = os.environ.get("EXPORTS_BUCKET", "test-exports-bucket")
-        s3_bucket.put_object(Bucket=bucket_name, Key=s3_key, Body=b"fake-qr-data")
+        s3_bucket.put_object(Bucket=BUCKET_NAME, Key=s3_key, Body=b"fake-qr-data")
 
         event: Dict[str, Any] = {
             "qrCodeUrl": s3_key,
@@ -153,6 +152,49 @@ class TestGenerateQrCodePresignedUrl:
         # URL should have signing parameters
         assert "Signature=" in result or "X-Amz-Signature" in result
 
+    def test_reuses_presigned_url_within_cache_window(self) -> None:
+        """Test that the same owner/key pair is only presigned once per cache window."""
+        event: Dict[str, Any] = {
+            "qrCodeUrl": "payment-qr-codes/account-123/venmo.png",
+            "ownerAccountId": "account-123",
+            "identity": {"sub": "account-123"},
+            "methodName": "Venmo",
+            "s3Key": "payment-qr-codes/account-123/venmo.png",
+        }
+
+        with (
+            patch("src.handlers.generate_qr_code_presigned_url.generate_presigned_get_url") as mock_generate,
+            patch("src.handlers.generate_qr_code_presigned_url.time.time") as mock_time,
+        ):
+            mock_generate.side_effect = ["https://example.com/first", "https://example.com/second"]
+            mock_time.return_value = 1000.0
+            first = generate_qr_code_presigned_url(event, None)
+            mock_time.return_value = 1100.0
+            second = generate_qr_code_presigned_url(event, None)
+            mock_time.return_value = 1300.0
+            third = generate_qr_code_presigned_url(event, None)
+
+        assert first == second == "https://example.com/first"
+        assert third == "https://example.com/second"
+        assert mock_generate.call_count == 2
+
+    def test_does_not_cache_without_s3_key(self) -> None:
+        """Test that lookups without an S3 key are presigned on every call."""
+        event: Dict[str, Any] = {
+            "qrCodeUrl": "payment-qr-codes/account-123/venmo.png",
+            "ownerAccountId": "account-123",
+            "identity": {"sub": "account-123"},
+            "methodName": "Venmo",
+        }
+
+        with patch("src.handlers.generate_qr_code_presigned_url.generate_presigned_get_url") as mock_generate:
+            mock_generate.return_value = "https://example.com/qr"
+            generate_qr_code_presigned_url(event, None)
+            generate_qr_code_presigned_url(event, None)
+
+        assert mock_generate.call_count == 2
+        mock_generate.assert_called_with("account-123", "Venmo", None, expiry_seconds=900)
+
     def test_handles_generic_exception(self) -> None:
         """Test that generic exceptions are wrapped in INTERNAL_ERROR."""
         event: Dict[str, Any] = {
@@ -177,8 +219,7 @@ class TestGenerateQrCodePresignedUrl:
         owner_account_id = "account-123"
         s3_key = f"payment-qr-codes/{owner_account_id}/default.png"
 
-        bucket_name = os.environ.get("EXPORTS_BUCKET", "test-exports-bucket")
-        s3_bucket.put_object(Bucket=bucket_name, Key=s3_key, Body=b"fake-qr-data")
+        s3_bucket.put_object(Bucket=BUCKET_NAME, Key=s3_key, Body=b"fake-qr-data")
 
         event: Dict[str, Any] = {
             "qrCodeUrl": s3_key,
@@ -1,568 +1,563 @@
 """Unit tests for list_catalogs_in_use Lambda handler."""
 
-from typing import Any, Dict, List, Set
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Set
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.handlers.list_catalogs_in_use import (
+    _async_get_all_catalog_ids,
+    _async_get_campaigns_for_profile,
+    _async_get_owned_profile_ids,
+    _async_get_shared_campaign_catalog_ids,
+    _async_get_shared_profile_ids,
+    handler,
+)
+from src.utils.errors import AppError, ErrorCode
 
-class TestAsyncGetOwnedProfileIds:
-    """Tests for _async_get_owned_profile_ids helper."""
+# Async test classes share one module-scoped event loop instead of creating a fresh loop per test
+module_loop = pytest.mark.asyncio(loop_scope="module")
 
-    @pytest.mark.asyncio
-    async def test_returns_profile_ids_from_owned_profiles(self) -> None:
-        """Should return profile IDs from profiles owned by the account."""
-        from src.handlers.list_catalogs_in_use import _async_get_owned_profile_ids
 
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"profileId": "PROFILE#prof1"},
-                {"profileId": "PROFILE#prof2"},
-            ]
-        }
+class FakeDynamoDBClient:
+    """Minimal async stand-in for an aioboto3 DynamoDB client and its query paginator, replaying canned pages.
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+    Each query returns the next page; the last page repeats once the list is exhausted.
+    A page that is an exception instance is raised instead of returned.
+    """
 
-        result = await _async_get_owned_profile_ids(mock_dynamodb, "profiles-table", "ACCOUNT#test-user")
+    def __init__(self) -> None:
+        self.pages: List[Any] = []
+        self.calls: List[Dict[str, Any]] = []
 
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
-        mock_table.query.assert_called_once_with(
-            KeyConditionExpression="ownerAccountId = :ownerAccountId",
-            ExpressionAttributeValues={":ownerAccountId": "ACCOUNT#test-user"},
-            ProjectionExpression="profileId",
-        )
+    async def query(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append(kwargs)
+        page = self.pages[min(len(self.calls), len(self.pages)) - 1]
+        if isinstance(page, BaseException):
+            raise page
+        return dict(page)
 
-    @pytest.mark.asyncio
-    async def test_returns_empty_list_when_no_profiles(self) -> None:
-        """Should return empty list when account has no profiles."""
-        from src.handlers.list_catalogs_in_use import _async_get_owned_profile_ids
+    def get_paginator(self, operation_name: str) -> "FakeDynamoDBClient":
+        assert operation_name == "query"
+        return self  # The fake doubles as its own query paginator
 
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {"Items": []}
+    async def paginate(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Mirror the botocore query paginator: follow LastEvaluatedKey via ExclusiveStartKey until it is absent."""
+        page = await self.query(**kwargs)
+        yield page
+        while "LastEvaluatedKey" in page:
+            page = await self.query(**kwargs, ExclusiveStartKey=page["LastEvaluatedKey"])
+            yield page
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
 
-        result = await _async_get_owned_profile_ids(mock_dynamodb, "profiles-table", "ACCOUNT#test-user")
-
-        assert result == []
-
-    @pytest.mark.asyncio
-    async def test_handles_pagination(self) -> None:
-        """Should handle paginated results."""
-        from src.handlers.list_catalogs_in_use import _async_get_owned_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"profileId": "PROFILE#prof1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
-            {
-                "Items": [{"profileId": "PROFILE#prof2"}],
-            },
-        ]
+def S(value: str) -> Dict[str, str]:
+    """Wrap a string as a raw DynamoDB string AttributeValue."""
+    return {"S": value}
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
 
-        result = await _async_get_owned_profile_ids(mock_dynamodb, "profiles-table", "ACCOUNT#test-user")
+@pytest.fixture
+def mock_client() -> FakeDynamoDBClient:
+    """Return a fake low-level DynamoDB client."""
+    return FakeDynamoDBClient()
 
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
-        assert mock_table.query.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_handles_pagination_with_items_in_continuation(self) -> None:
-        """Should collect items from paginated continuation that includes items without profileId."""
-        from src.handlers.list_catalogs_in_use import _async_get_owned_profile_ids
+@module_loop
+class TestAsyncGetOwnedProfileIds:
+    """Tests for _async_get_owned_profile_ids helper."""
 
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"profileId": "PROFILE#prof1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
+    async def test_returns_profile_ids_from_owned_profiles(self, mock_client: FakeDynamoDBClient) -> None:
+        """Should return profile IDs from profiles owned by the account."""
+        mock_client.pages = [
             {
-                "Items": [{"profileId": "PROFILE#prof2"}, {}],  # Include item without profileId
-            },
+                "Items": [
+                    {"profileId": S("PROFILE#prof1")},
+                    {"profileId": S("PROFILE#prof2")},
+                ]
+            }
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_owned_profile_ids(mock_dynamodb, "profiles-table", "ACCOUNT#test-user")
-
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
+        result = await _async_get_owned_profile_ids(mock_client, "profiles-table", "ACCOUNT#test-user")
 
-    @pytest.mark.asyncio
-    async def test_skips_items_without_profile_id(self) -> None:
-        """Should skip items that don't have profileId."""
-        from src.handlers.list_catalogs_in_use import _async_get_owned_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"profileId": "PROFILE#prof1"},
-                {},  # Missing profileId
-                {"profileId": None},  # None profileId
-            ]
-        }
+        assert result == {"PROFILE#prof1", "PROFILE#prof2"}
+        assert mock_client.calls == [
+            dict(
+                TableName="profiles-table",
+                KeyConditionExpression="ownerAccountId = :ownerAccountId",
+                ExpressionAttributeValues={":ownerAccountId": S("ACCOUNT#test-user")},
+                ProjectionExpression="profileId",
+            )
+        ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+    async def test_returns_empty_list_when_no_profiles(self, mock_client: FakeDynamoDBClient) -> None:
+        """Should return empty list when account has no profiles."""
+        mock_client.pages = [{"Items": []}]
 
-        result = await _async_get_owned_profile_ids(mock_dynamodb, "profiles-table", "ACCOUNT#test-user")
+        result = await _async_get_owned_profile_ids(mock_client, "profiles-table", "ACCOUNT#test-user")
 
-        assert result == ["PROFILE#prof1"]
+        assert result == set()
 
 
+@module_loop
 class TestAsyncGetSharedProfileIds:
     """Tests for _async_get_shared_profile_ids helper."""
 
-    @pytest.mark.asyncio
-    async def test_returns_profile_ids_from_shares(self) -> None:
+    async def test_returns_profile_ids_from_shares(self, mock_client: FakeDynamoDBClient) -> None:
         """Should return profile IDs shared with the account."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"profileId": "PROFILE#prof1"},
-                {"profileId": "PROFILE#prof2"},
-            ]
-        }
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_shared_profile_ids(mock_dynamodb, "shares-table", "ACCOUNT#test-user")
-
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
-        mock_table.query.assert_called_once_with(
-            IndexName="targetAccountId-index",
-            KeyConditionExpression="targetAccountId = :targetAccountId",
-            ExpressionAttributeValues={":targetAccountId": "ACCOUNT#test-user"},
-            ProjectionExpression="profileId",
-        )
-
-    @pytest.mark.asyncio
-    async def test_returns_empty_list_when_no_shares(self) -> None:
-        """Should return empty list when account has no shares."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {"Items": []}
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_shared_profile_ids(mock_dynamodb, "shares-table", "ACCOUNT#test-user")
-
-        assert result == []
-
-    @pytest.mark.asyncio
-    async def test_handles_pagination(self) -> None:
-        """Should handle paginated results."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"profileId": "PROFILE#prof1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
+        mock_client.pages = [
             {
-                "Items": [{"profileId": "PROFILE#prof2"}],
-            },
+                "Items": [
+                    {"profileId": S("PROFILE#prof1")},
+                    {"profileId": S("PROFILE#prof2")},
+                ]
+            }
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_shared_profile_ids(mock_dynamodb, "shares-table", "ACCOUNT#test-user")
+        result = await _async_get_shared_profile_ids(mock_client, "shares-table", "ACCOUNT#test-user")
 
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
-        assert mock_table.query.call_count == 2
-
-    @pytest.mark.asyncio
-    async def test_handles_pagination_with_items_in_continuation(self) -> None:
-        """Should collect items from paginated continuation including missing profileId."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"profileId": "PROFILE#prof1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
-            {
-                "Items": [{"profileId": "PROFILE#prof2"}, {}],  # Include item without profileId
-            },
+        assert result == {"PROFILE#prof1", "PROFILE#prof2"}
+        assert mock_client.calls == [
+            dict(
+                TableName="shares-table",
+                IndexName="targetAccountId-index",
+                KeyConditionExpression="targetAccountId = :targetAccountId",
+                ExpressionAttributeValues={":targetAccountId": S("ACCOUNT#test-user")},
+                ProjectionExpression="profileId",
+            )
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_shared_profile_ids(mock_dynamodb, "shares-table", "ACCOUNT#test-user")
-
-        assert result == ["PROFILE#prof1", "PROFILE#prof2"]
-
-    @pytest.mark.asyncio
-    async def test_skips_items_without_profile_id(self) -> None:
-        """Should skip items that don't have profileId."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_profile_ids
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"profileId": "PROFILE#prof1"},
-                {},  # Missing profileId
-            ]
-        }
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+    async def test_returns_empty_list_when_no_shares(self, mock_client: FakeDynamoDBClient) -> None:
+        """Should return empty list when account has no shares."""
+        mock_client.pages = [{"Items": []}]
 
-        result = await _async_get_shared_profile_ids(mock_dynamodb, "shares-table", "ACCOUNT#test-user")
+        result = await _async_get_shared_profile_ids(mock_client, "shares-table", "ACCOUNT#test-user")
 
-        assert result == ["PROFILE#prof1"]
+        assert result == set()
 
 
+@module_loop
 class TestAsyncGetCampaignsForProfile:
     """Tests for _async_get_campaigns_for_profile helper."""
 
-    @pytest.mark.asyncio
-    async def test_returns_catalog_ids_from_profile_campaigns(self) -> None:
+    async def test_returns_catalog_ids_from_profile_campaigns(self, mock_client: FakeDynamoDBClient) -> None:
         """Should return catalog IDs from campaigns for a profile."""
-        from src.handlers.list_catalogs_in_use import _async_get_campaigns_for_profile
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"catalogId": "CATALOG#cat1"},
-                {"catalogId": "CATALOG#cat2"},
-            ]
-        }
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
-        result = await _async_get_campaigns_for_profile(mock_dynamodb, "campaigns-table", "PROFILE#prof1")
-
-        assert result == {"CATALOG#cat1", "CATALOG#cat2"}
-        mock_table.query.assert_called_once_with(
-            KeyConditionExpression="profileId = :profileId",
-            ExpressionAttributeValues={":profileId": "PROFILE#prof1"},
-            ProjectionExpression="catalogId",
-        )
-
-    @pytest.mark.asyncio
-    async def test_skips_items_without_catalog_id_in_first_page(self) -> None:
-        """Should skip items without catalogId in the first page."""
-        from src.handlers.list_catalogs_in_use import _async_get_campaigns_for_profile
-
-        mock_table = AsyncMock()
-        mock_table.query.return_value = {
-            "Items": [
-                {"catalogId": "CATALOG#cat1"},
-                {},  # Missing catalogId
-                {"catalogId": "CATALOG#cat2"},
-            ]
-        }
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+        mock_client.pages = [
+            {
+                "Items": [
+                    {"catalogId": S("CATALOG#cat1")},
+                    {"catalogId": S("CATALOG#cat2")},
+                ]
+            }
+        ]
 
-        result = await _async_get_campaigns_for_profile(mock_dynamodb, "campaigns-table", "PROFILE#prof1")
+        result = await _async_get_campaigns_for_profile(mock_client, "campaigns-table", "PROFILE#prof1")
 
         assert result == {"CATALOG#cat1", "CATALOG#cat2"}
+        assert mock_client.calls == [
+            dict(
+                TableName="campaigns-table",
+                KeyConditionExpression="profileId = :profileId",
+                ExpressionAttributeValues={":profileId": S("PROFILE#prof1")},
+                ProjectionExpression="catalogId",
+            )
+        ]
 
-    @pytest.mark.asyncio
-    async def test_handles_pagination(self) -> None:
-        """Should handle paginated results."""
-        from src.handlers.list_catalogs_in_use import _async_get_campaigns_for_profile
-
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
+    async def test_skips_items_without_catalog_id_in_pagination(self, mock_client: FakeDynamoDBClient) -> None:
+        """Should skip items without catalogId in paginated continuation."""
+        mock_client.pages = [
             {
-                "Items": [{"catalogId": "CATALOG#cat1"}],
+                "Items": [{"catalogId": S("CATALOG#cat1")}],
                 "LastEvaluatedKey": {"pk": "key1"},
             },
             {
-                "Items": [{"catalogId": "CATALOG#cat2"}],
+                "Items": [{"other": "value"}, {"catalogId": {"NULL": True}}],  # All items missing/NULL catalogId
             },
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+        result = await _async_get_campaigns_for_profile(mock_client, "campaigns-table", "PROFILE#prof1")
 
-        result = await _async_get_campaigns_for_profile(mock_dynamodb, "campaigns-table", "PROFILE#prof1")
+        # Should only have cat1 from first page
+        assert result == {"CATALOG#cat1"}
 
-        assert result == {"CATALOG#cat1", "CATALOG#cat2"}
-        assert mock_table.query.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_handles_pagination_with_items_in_continuation(self) -> None:
-        """Should collect items from paginated continuation including missing catalogId."""
-        from src.handlers.list_catalogs_in_use import _async_get_campaigns_for_profile
+_PAGINATED_HELPERS = [
+    pytest.param(_async_get_owned_profile_ids, "profileId", id="owned-profiles"),
+    pytest.param(_async_get_shared_profile_ids, "profileId", id="shared-profiles"),
+    pytest.param(_async_get_campaigns_for_profile, "catalogId", id="profile-campaigns"),
+]
 
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"catalogId": "CATALOG#cat1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
-            {
-                "Items": [{"catalogId": "CATALOG#cat2"}, {}],  # Include item without catalogId
-            },
+
+@module_loop
+class TestPaginatedQueryHelpers:
+    """Pagination and missing-attribute handling shared by the single-attribute query helpers."""
+
+    @pytest.mark.parametrize(("helper", "key"), _PAGINATED_HELPERS)
+    async def test_handles_pagination(
+        self, mock_client: FakeDynamoDBClient, helper: Callable[..., Awaitable[Any]], key: str
+    ) -> None:
+        """Should follow LastEvaluatedKey and collect values from every page."""
+        mock_client.pages = [
+            {"Items": [{key: S("ID#1")}], "LastEvaluatedKey": {"pk": "key1"}},
+            {"Items": [{key: S("ID#2")}]},
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+        result = await helper(mock_client, "test-table", "PK#test")
 
-        result = await _async_get_campaigns_for_profile(mock_dynamodb, "campaigns-table", "PROFILE#prof1")
+        assert result == {"ID#1", "ID#2"}
+        assert len(mock_client.calls) == 2
 
-        assert result == {"CATALOG#cat1", "CATALOG#cat2"}
+    @pytest.mark.parametrize(("helper", "key"), _PAGINATED_HELPERS)
+    async def test_handles_pagination_with_items_in_continuation(
+        self, mock_client: FakeDynamoDBClient, helper: Callable[..., Awaitable[Any]], key: str
+    ) -> None:
+        """Should collect items from a continuation page that also contains items without the key."""
+        mock_client.pages = [
+            {"Items": [{key: S("ID#1")}], "LastEvaluatedKey": {"pk": "key1"}},
+            {"Items": [{key: S("ID#2")}, {}]},  # Include item without the key
+        ]
 
-    @pytest.mark.asyncio
-    async def test_skips_items_without_catalog_id_in_pagination(self) -> None:
-        """Should skip items without catalogId in paginated continuation."""
-        from src.handlers.list_catalogs_in_use import _async_get_campaigns_for_profile
+        result = await helper(mock_client, "test-table", "PK#test")
 
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = [
-            {
-                "Items": [{"catalogId": "CATALOG#cat1"}],
-                "LastEvaluatedKey": {"pk": "key1"},
-            },
+        assert result == {"ID#1", "ID#2"}
+
+    @pytest.mark.parametrize(("helper", "key"), _PAGINATED_HELPERS)
+    async def test_skips_items_without_key(
+        self, mock_client: FakeDynamoDBClient, helper: Callable[..., Awaitable[Any]], key: str
+    ) -> None:
+        """Should skip items where the projected key is missing or None."""
+        mock_client.pages = [
             {
-                "Items": [{"other": "value"}, {"catalogId": None}],  # All items missing/null catalogId
-            },
+                "Items": [
+                    {key: S("ID#1")},
+                    {},  # Missing key
+                    {key: {"NULL": True}},  # NULL key
+                ]
+            }
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+        result = await helper(mock_client, "test-table", "PK#test")
 
-        result = await _async_get_campaigns_for_profile(mock_dynamodb, "campaigns-table", "PROFILE#prof1")
-
-        # Should only have cat1 from first page
-        assert result == {"CATALOG#cat1"}
+        assert result == {"ID#1"}
 
 
+@module_loop
 class TestAsyncGetSharedCampaignCatalogIds:
     """Tests for _async_get_shared_campaign_catalog_ids helper."""
 
-    @pytest.mark.asyncio
     async def test_returns_empty_set_for_empty_profile_list(self) -> None:
         """Should return empty set when no profile IDs provided."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_campaign_catalog_ids
-
         mock_dynamodb = AsyncMock()
-        result = await _async_get_shared_campaign_catalog_ids(mock_dynamodb, "campaigns-table", [])
+        result = await _async_get_shared_campaign_catalog_ids(mock_dynamodb, "campaigns-table", set())
 
         assert result == set()
 
-    @pytest.mark.asyncio
-    async def test_aggregates_catalog_ids_from_multiple_profiles(self) -> None:
+    async def test_aggregates_catalog_ids_from_multiple_profiles(self, mock_client: FakeDynamoDBClient) -> None:
         """Should aggregate catalog IDs from all profiles."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_campaign_catalog_ids
-
-        mock_table = AsyncMock()
         # First call returns cat1, cat2; second call returns cat2, cat3
-        mock_table.query.side_effect = [
-            {"Items": [{"catalogId": "CATALOG#cat1"}, {"catalogId": "CATALOG#cat2"}]},
-            {"Items": [{"catalogId": "CATALOG#cat2"}, {"catalogId": "CATALOG#cat3"}]},
+        mock_client.pages = [
+            {"Items": [{"catalogId": S("CATALOG#cat1")}, {"catalogId": S("CATALOG#cat2")}]},
+            {"Items": [{"catalogId": S("CATALOG#cat2")}, {"catalogId": S("CATALOG#cat3")}]},
         ]
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
-
         result = await _async_get_shared_campaign_catalog_ids(
-            mock_dynamodb, "campaigns-table", ["PROFILE#prof1", "PROFILE#prof2"]
+            mock_client, "campaigns-table", {"PROFILE#prof1", "PROFILE#prof2"}
         )
 
         # Should deduplicate cat2
         assert result == {"CATALOG#cat1", "CATALOG#cat2", "CATALOG#cat3"}
 
-    @pytest.mark.asyncio
-    async def test_handles_query_errors_gracefully(self) -> None:
+    async def test_handles_query_errors_gracefully(self, mock_client: FakeDynamoDBClient) -> None:
         """Should continue processing if one profile query fails."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_campaign_catalog_ids
-
-        call_count = 0
-
-        async def mock_query(**kwargs: object) -> Dict[str, List[Dict[str, str]]]:
-            nonlocal call_count
-            call_count += 1
-            # First call succeeds, second raises an exception
-            if call_count == 1:
-                return {"Items": [{"catalogId": "CATALOG#cat1"}]}
-            raise Exception("DynamoDB error")
-
-        mock_table = AsyncMock()
-        mock_table.query.side_effect = mock_query
-
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table.return_value = mock_table
+        # First call succeeds, second raises an exception
+        mock_client.pages = [{"Items": [{"catalogId": S("CATALOG#cat1")}]}, Exception("DynamoDB error")]
 
         result = await _async_get_shared_campaign_catalog_ids(
-            mock_dynamodb, "campaigns-table", ["PROFILE#prof1", "PROFILE#prof2"]
+            mock_client, "campaigns-table", {"PROFILE#prof1", "PROFILE#prof2"}
         )
 
         # Should return results from successful query
         assert result == {"CATALOG#cat1"}
 
-    @pytest.mark.asyncio
-    async def test_ignores_non_set_non_exception_results(self) -> None:
-        """Should skip results that are neither a set nor an exception."""
-        from src.handlers.list_catalogs_in_use import _async_get_shared_campaign_catalog_ids
+    async def test_queries_all_profiles_concurrently(self) -> None:
+        """Should have every per-profile campaign query in flight at once rather than awaiting them in turn."""
+        in_flight = 0
+        max_in_flight = 0
 
         async def mock_get_campaigns(
-            dynamodb: Any, table_name: str, profile_id: str
-        ) -> object:
-            if profile_id == "PROFILE#prof1":
-                return {"CATALOG#cat1"}
-            # Return an unexpected scalar type to exercise the else-false branch.
-            return "ignored"
+            dynamodb: Any, table_name: str, profile_id: str, catalog_ids: Set[str]
+        ) -> Set[str]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)  # Yield so the other profile queries can start
+            in_flight -= 1
+            catalog_ids.add(f"CATALOG#{profile_id}")
+            return catalog_ids
+
+        profile_ids = {"PROFILE#prof1", "PROFILE#prof2", "PROFILE#prof3"}
+        with patch("src.handlers.list_catalogs_in_use._async_get_campaigns_for_profile", mock_get_campaigns):
+            result = await _async_get_shared_campaign_catalog_ids(AsyncMock(), "campaigns-table", profile_ids)
+
+        assert max_in_flight == len(profile_ids)
+        assert result == {f"CATALOG#{pid}" for pid in profile_ids}
+
+    async def test_streams_all_profiles_into_one_set(self) -> None:
+        """Should hand every per-profile query the same result set instead of unioning per-profile sets."""
+        received_sets: List[Set[str]] = []
 
-        import src.handlers.list_catalogs_in_use as module
+        async def mock_get_campaigns(
+            dynamodb: Any, table_name: str, profile_id: str, catalog_ids: Set[str]
+        ) -> Set[str]:
+            received_sets.append(catalog_ids)
+            catalog_ids.add("CATALOG#cat1")
+            return catalog_ids
 
-        original = module._async_get_campaigns_for_profile
-        module._async_get_campaigns_for_profile = mock_get_campaigns
-        try:
+        with patch("src.handlers.list_catalogs_in_use._async_get_campaigns_for_profile", mock_get_campaigns):
             result = await _async_get_shared_campaign_catalog_ids(
-                AsyncMock(), "campaigns-table", ["PROFILE#prof1", "PROFILE#prof2"]
+                AsyncMock(), "campaigns-table", {"PROFILE#prof1", "PROFILE#prof2"}
             )
-        finally:
-            module._async_get_campaigns_for_profile = original
 
         assert result == {"CATALOG#cat1"}
+        assert len(received_sets) == 2
+        assert all(received is result for received in received_sets)
 
 
-class TestAsyncGetAllCatalogIds:
-    """Tests for _async_get_all_catalog_ids orchestrator."""
+@module_loop
+class TestGetDynamoDB:
+    """Tests for the cached low-level DynamoDB client."""
 
-    @pytest.mark.asyncio
-    async def test_runs_owned_and_shared_profiles_in_parallel(self) -> None:
-        """Should run owned profiles and shared profiles queries concurrently."""
-        import importlib
+    async def test_opens_client_once_and_reuses_it(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should create the session and enter the client context once, then reuse the client."""
+        import src.handlers.list_catalogs_in_use as module
 
+        mock_client = FakeDynamoDBClient()
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__.return_value = mock_client
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_context_manager
+        mock_session_class = MagicMock(return_value=mock_session)
+        monkeypatch.setattr(module, "_session", None)
+        monkeypatch.setattr(module, "_dynamodb_client", None)
+        monkeypatch.setattr(module.aioboto3, "Session", mock_session_class)
+        monkeypatch.setenv("DYNAMODB_ENDPOINT", "http://localhost:4566")
+
+        first = await module._get_dynamodb()
+        second = await module._get_dynamodb()
+
+        assert first is second is mock_client
+        assert module._get_session() is mock_session
+        mock_session_class.assert_called_once_with()
+        mock_session.client.assert_called_once_with(
+            "dynamodb", endpoint_url="http://localhost:4566", config=module._DYNAMODB_CONFIG
+        )
+        mock_context_manager.__aenter__.assert_awaited_once()
+
+    async def test_client_config_is_tuned_for_fan_out(self) -> None:
+        """Should size the connection pool for the fan-out, bound timeouts, and retry adaptively."""
         import src.handlers.list_catalogs_in_use as module
 
-        # Reload to ensure clean state
-        importlib.reload(module)
+        config = module._DYNAMODB_CONFIG
+        assert config.max_pool_connections == 50
+        assert config.connect_timeout == 5
+        assert config.read_timeout == 10
+        assert config.retries == {"mode": "adaptive", "max_attempts": 3}
 
-        mock_profiles_table = AsyncMock()
-        mock_profiles_table.query.return_value = {"Items": [{"profileId": "PROFILE#owned1"}]}
 
-        mock_campaigns_table = AsyncMock()
-        mock_campaigns_table.query.return_value = {"Items": [{"catalogId": "CATALOG#cat1"}]}
+def routed_client(items_by_table: Dict[str, List[Dict[str, Any]]]) -> FakeDynamoDBClient:
+    """Build a fake client whose query returns canned items per table (matched by name substring)."""
+    mock_dynamodb = FakeDynamoDBClient()
 
-        mock_shares_table = AsyncMock()
-        mock_shares_table.query.return_value = {"Items": [{"profileId": "PROFILE#shared1"}]}
+    async def mock_query(TableName: str, **kwargs: Any) -> Dict[str, Any]:
+        """Return the canned items for the queried table."""
+        return {"Items": next(items for name, items in items_by_table.items() if name in TableName)}
 
-        async def mock_table(table_name: str) -> AsyncMock:
-            """Return the appropriate mock table based on name."""
-            if "profiles" in table_name:
-                return mock_profiles_table
-            if "campaigns" in table_name:
-                return mock_campaigns_table
-            return mock_shares_table
+    mock_dynamodb.query = mock_query  # type: ignore[method-assign]
+    return mock_dynamodb
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table = mock_table
 
-        mock_session = MagicMock()
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.return_value = mock_dynamodb
-        mock_context_manager.__aexit__.return_value = None
-        mock_session.resource.return_value = mock_context_manager
+@module_loop
+class TestAsyncGetAllCatalogIds:
+    """Tests for _async_get_all_catalog_ids orchestrator."""
 
-        # Patch directly on the module after reload
-        original_session = module.aioboto3.Session
-        module.aioboto3.Session = MagicMock(return_value=mock_session)
-        try:
-            owned, shared_profiles, shared_catalogs = await module._async_get_all_catalog_ids("ACCOUNT#test-user")
-        finally:
-            module.aioboto3.Session = original_session
+    async def test_runs_owned_and_shared_profiles_in_parallel(self) -> None:
+        """Should run owned profiles and shared profiles queries concurrently."""
+        mock_dynamodb = routed_client(
+            {
+                "profiles": [{"profileId": S("PROFILE#owned1")}],
+                "campaigns": [{"catalogId": S("CATALOG#cat1")}],
+                "shares": [{"profileId": S("PROFILE#shared1")}],
+            }
+        )
+
+        owned, shared_profiles, shared_catalogs = await _async_get_all_catalog_ids(
+            "ACCOUNT#test-user", dynamodb=mock_dynamodb
+        )
 
         assert owned == {"CATALOG#cat1"}
-        assert shared_profiles == ["PROFILE#shared1"]
+        assert shared_profiles == {"PROFILE#shared1"}
         assert shared_catalogs == {"CATALOG#cat1"}
 
-    @pytest.mark.asyncio
     async def test_returns_empty_shared_catalogs_when_no_shared_profiles(self) -> None:
         """Should return empty shared catalogs when user has no shared profiles."""
-        import importlib
-        import os
+        mock_dynamodb = routed_client(
+            {
+                "profiles": [{"profileId": S("PROFILE#owned1")}],
+                "campaigns": [{"catalogId": S("CATALOG#cat1")}],
+                "shares": [],  # No shares
+            }
+        )
+
+        owned, shared_profiles, shared_catalogs = await _async_get_all_catalog_ids(
+            "ACCOUNT#test-user", dynamodb=mock_dynamodb
+        )
+
+        assert owned == {"CATALOG#cat1"}
+        assert shared_profiles == set()
+        assert shared_catalogs == set()
 
+    async def test_defaults_to_cached_client(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should query through the cached module client when no client is passed in."""
         import src.handlers.list_catalogs_in_use as module
 
-        # Set environment variables to ensure correct table names
-        os.environ["PROFILES_TABLE_NAME"] = "test-profiles"
-        os.environ["CAMPAIGNS_TABLE_NAME"] = "test-campaigns"
-        os.environ["SHARES_TABLE_NAME"] = "test-shares"
+        mock_dynamodb = routed_client({"profiles": [], "campaigns": [], "shares": []})
 
-        # Reload to ensure clean state
-        importlib.reload(module)
+        async def mock_get_dynamodb() -> FakeDynamoDBClient:
+            return mock_dynamodb
 
-        # Create separate mock tables for each query
-        mock_profiles_table = AsyncMock()
-        mock_profiles_table.query.return_value = {"Items": [{"profileId": "PROFILE#owned1"}]}
+        monkeypatch.setattr(module, "_get_dynamodb", mock_get_dynamodb)
 
-        mock_campaigns_table = AsyncMock()
-        mock_campaigns_table.query.return_value = {"Items": [{"catalogId": "CATALOG#cat1"}]}
+        result = await _async_get_all_catalog_ids("ACCOUNT#test-user")
 
-        mock_shares_table = AsyncMock()
-        mock_shares_table.query.return_value = {"Items": []}  # No shares
+        assert result == (set(), set(), set())
 
-        async def mock_table(table_name: str) -> AsyncMock:
-            """Return the appropriate mock table based on name."""
-            if "profiles" in table_name:
-                return mock_profiles_table
-            if "campaigns" in table_name:
-                return mock_campaigns_table
-            return mock_shares_table
+    async def test_owned_chain_does_not_wait_for_shared_profiles(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should query owned-profile campaigns while the shared-profile lookup is still pending."""
+        import src.handlers.list_catalogs_in_use as module
 
-        mock_dynamodb = AsyncMock()
-        mock_dynamodb.Table = mock_table
+        owned_catalogs_queried = asyncio.Event()
 
-        mock_session = MagicMock()
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.return_value = mock_dynamodb
-        mock_context_manager.__aexit__.return_value = None
-        mock_session.resource.return_value = mock_context_manager
+        async def mock_get_owned_profile_ids(dynamodb: Any, table_name: str, account_id: str) -> Set[str]:
+            return {"PROFILE#owned1"}
 
-        # Patch directly on the module after reload
-        original_session = module.aioboto3.Session
-        module.aioboto3.Session = MagicMock(return_value=mock_session)
-        try:
-            owned, shared_profiles, shared_catalogs = await module._async_get_all_catalog_ids("ACCOUNT#test-user")
-        finally:
-            module.aioboto3.Session = original_session
+        async def mock_get_shared_profile_ids(dynamodb: Any, table_name: str, account_id: str) -> Set[str]:
+            await owned_catalogs_queried.wait()  # Only resolves if the owned chain runs ahead of this lookup
+            return {"PROFILE#shared1"}
 
-        assert owned == {"CATALOG#cat1"}
-        assert shared_profiles == []
-        assert shared_catalogs == set()
+        async def mock_get_catalog_ids(
+            dynamodb: Any, table_name: str, profile_ids: Set[str], request_logger: Any = None
+        ) -> Set[str]:
+            if profile_ids == {"PROFILE#owned1"}:
+                owned_catalogs_queried.set()
+            return {f"CATALOG#{profile_id}" for profile_id in profile_ids}
+
+        monkeypatch.setattr(module, "_async_get_owned_profile_ids", mock_get_owned_profile_ids)
+        monkeypatch.setattr(module, "_async_get_shared_profile_ids", mock_get_shared_profile_ids)
+        monkeypatch.setattr(module, "_async_get_shared_campaign_catalog_ids", mock_get_catalog_ids)
+
+        owned, shared_profiles, shared_catalogs = await asyncio.wait_for(
+            _async_get_all_catalog_ids("ACCOUNT#test-user", dynamodb=object()), timeout=1
+        )
+
+        assert owned == {"CATALOG#PROFILE#owned1"}
+        assert shared_profiles == {"PROFILE#shared1"}
+        assert shared_catalogs == {"CATALOG#PROFILE#shared1"}
 
 
 class TestHandler:
     """Tests for the main handler function."""
 
+    def test_reuses_event_loop_across_calls(self) -> None:
+        """Should run every invocation on the same module event loop."""
+        event = {"identity": {"sub": "test-user-id"}}
+        loops: List[asyncio.AbstractEventLoop] = []
+
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
+            loops.append(asyncio.get_running_loop())
+            return (set(), set(), set())
+
+        with patch(
+            "src.handlers.list_catalogs_in_use._async_get_all_catalog_ids",
+            side_effect=mock_get_all,
+        ):
+            handler(event, None)
+            handler(event, None)
+
+        assert len(loops) == 2
+        assert loops[0] is loops[1]
+        assert not loops[0].is_closed()
+
+    def test_replaces_closed_event_loop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should open a new module event loop, and a new client on it, if the cached loop has been closed."""
+        import src.handlers.list_catalogs_in_use as module
+
+        stale_client = FakeDynamoDBClient()
+        fresh_client = FakeDynamoDBClient()
+        opened_on: List[asyncio.AbstractEventLoop] = []
+
+        async def enter_client(*args: Any) -> FakeDynamoDBClient:
+            opened_on.append(asyncio.get_running_loop())
+            return fresh_client
+
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__.side_effect = enter_client
+        mock_session = MagicMock()
+        mock_session.client.return_value = mock_context_manager
+        closed_loop = asyncio.new_event_loop()
+        closed_loop.close()
+        monkeypatch.setattr(module, "_loop", closed_loop)
+        monkeypatch.setattr(module, "_dynamodb_client", stale_client)
+        monkeypatch.setattr(module, "_session", mock_session)
+
+        loop = module._get_event_loop()
+        try:
+            client = loop.run_until_complete(module._get_dynamodb())
+        finally:
+            loop.close()
+
+        assert loop is not closed_loop
+        # The client bound to the closed loop is dropped and a fresh one is opened on the new loop
+        assert client is fresh_client
+        assert opened_on == [loop]
+
+    def test_cancels_sibling_chain_when_one_fails(self) -> None:
+        """Should cancel tasks left pending by a failed invocation instead of resuming them on the next one."""
+        import src.handlers.list_catalogs_in_use as module
+
+        event = {"identity": {"sub": "test-user-id"}}
+        sibling_cancelled: List[bool] = []
+
+        async def failing_chain() -> None:
+            raise RuntimeError("Query failed")
+
+        async def slow_chain() -> None:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                sibling_cancelled.append(True)
+                raise
+
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
+            await asyncio.gather(slow_chain(), failing_chain())
+            return (set(), set(), set())
+
+        with patch(
+            "src.handlers.list_catalogs_in_use._async_get_all_catalog_ids",
+            side_effect=mock_get_all,
+        ):
+            with pytest.raises(AppError):
+                handler(event, None)
+
+        assert sibling_cancelled == [True]
+        assert not asyncio.all_tasks(module._get_event_loop())
+
     def test_returns_all_catalog_ids_sorted(self) -> None:
         """Should return all catalog IDs sorted."""
-        from src.handlers.list_catalogs_in_use import handler
-
         event = {"identity": {"sub": "test-user-id"}}
 
-        async def mock_get_all(
-            account_id: str, request_logger: Any = None
-        ) -> tuple[Set[str], List[str], Set[str]]:
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
             return (
                 {"CATALOG#cat2", "CATALOG#cat1"},
-                ["PROFILE#prof1"],
+                {"PROFILE#prof1"},
                 {"CATALOG#cat3", "CATALOG#cat1"},
             )
 
@@ -576,17 +571,13 @@ class TestHandler:
 
     def test_handles_account_id_with_prefix(self) -> None:
         """Should handle account ID that already has ACCOUNT# prefix."""
-        from src.handlers.list_catalogs_in_use import handler
-
         event = {"identity": {"sub": "ACCOUNT#test-user-id"}}
 
         captured_account_id: List[str] = []
 
-        async def mock_get_all(
-            account_id: str, request_logger: Any = None
-        ) -> tuple[Set[str], List[str], Set[str]]:
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
             captured_account_id.append(account_id)
-            return (set(), [], set())
+            return (set(), set(), set())
 
         with patch(
             "src.handlers.list_catalogs_in_use._async_get_all_catalog_ids",
@@ -599,14 +590,10 @@ class TestHandler:
 
     def test_returns_empty_list_when_no_catalogs(self) -> None:
         """Should return empty list when user has no campaigns."""
-        from src.handlers.list_catalogs_in_use import handler
-
         event = {"identity": {"sub": "test-user-id"}}
 
-        async def mock_get_all(
-            account_id: str, request_logger: Any = None
-        ) -> tuple[Set[str], List[str], Set[str]]:
-            return (set(), [], set())
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
+            return (set(), set(), set())
 
         with patch(
             "src.handlers.list_catalogs_in_use._async_get_all_catalog_ids",
@@ -618,14 +605,9 @@ class TestHandler:
 
     def test_raises_app_error_on_exception(self) -> None:
         """Should wrap unexpected exceptions in AppError."""
-        from src.handlers.list_catalogs_in_use import handler
-        from src.utils.errors import AppError, ErrorCode
-
         event = {"identity": {"sub": "test-user-id"}}
 
-        async def mock_get_all(
-            account_id: str, request_logger: Any = None
-        ) -> tuple[Set[str], List[str], Set[str]]:
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
             raise RuntimeError("Unexpected error")
 
         with patch(
@@ -640,14 +622,9 @@ class TestHandler:
 
     def test_reraises_app_error(self) -> None:
         """Should re-raise AppError without wrapping."""
-        from src.handlers.list_catalogs_in_use import handler
-        from src.utils.errors import AppError, ErrorCode
-
         event = {"identity": {"sub": "test-user-id"}}
 
-        async def mock_get_all(
-            account_id: str, request_logger: Any = None
-        ) -> tuple[Set[str], List[str], Set[str]]:
+        async def mock_get_all(account_id: str, request_logger: Any = None) -> tuple[Set[str], Set[str], Set[str]]:
             raise AppError(ErrorCode.NOT_FOUND, "Not found")
 
         with patch(